@@ -3,59 +3,120 @@
 # I have made some minor changes for Python version and better printing
 # but works the same as original
 
-# bug: not return a list of map() in expand
+# The module stays annotated throughout and mypy-clean, so ahead-of-time
+# compilers such as mypyc have real types to work with; nothing requires one
+
+from __future__ import annotations
 
 import math
 import operator as op
+import re
+from array import array
+from typing import Any
 
 """Type Definitions"""
-Symbol = str                # A Scheme Symbol is implemented as a Python str
+class Symbol(str):          # A Scheme Symbol is a distinct str subclass, so
+    __slots__ = ()          # eval can tell symbols from plain string values
+
+_symbol_table: dict = {}
+
+def Sym(s: str) -> Symbol:
+    """Find or create the unique (interned) Symbol for str s"""
+    sym = _symbol_table.get(s)
+    if sym is None:
+        sym = _symbol_table[s] = Symbol(s)
+    return sym
+
+# interned keywords, so eval can dispatch with 'is' instead of '=='
+_quote, _if, _define, _set, _lambda, _begin = map(Sym,
+"quote   if   define   set!   lambda   begin".split())
 Number = (int, float)       # A Scheme Number is implemented as a Python int or float
-Atom = (Symbol, Number)     # A Scheme Atom is a Symbol or Number
+Atom = Any                   # A Scheme Atom is a Symbol or Number
 List = list                 # A Scheme List is implemented as a Python list
-Exp = (Atom, List)          # A Scheme expression is an Atom or List
-Env = dict                  # A Scheme environment (defined below) 
+Exp = Any                    # A Scheme expression is an Atom or List
+                            # Env (a Scheme environment, defined below)
                             # is a mapping of {variable: value}
 
-def tokenize(chars: str) -> list:
-    """Convert a string of chars into a list of tokens."""
-    return chars.replace('(', ' ( ').replace(')', ' ) ').split()
+# token kind codes for the SoA token stream (parallel kinds/values arrays)
+_LPAREN, _RPAREN, _INT, _FLOAT, _SYM = range(5)
+
+# one alternation classifies while it lexes; the group order matches the
+# kind codes above, so the matched group number *is* the token kind.
+# numbers must end at a delimiter, so e.g. 1.2.3 still lexes as a symbol
+_TOKEN_RE = re.compile(
+    r'(\()'
+    r'|(\))'
+    r'|([-+]?\d+(?=[\s()]|$))'
+    r'|([-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?(?=[\s()]|$))'
+    r'|([^\s()]+)').finditer
+
+def tokenize(chars: str) -> tuple:
+    """Lex a string of chars into parallel (kinds, values) token arrays."""
+    # structure-of-arrays: the reader branches on a dense byte array of
+    # kinds while values holds the already-converted Python objects
+    kinds = array('b')
+    values: list = []
+    for m in _TOKEN_RE(chars):
+        k = (m.lastindex or 1) - 1  # never None: every alternative is a group
+        kinds.append(k)
+        if k == _SYM:
+            values.append(Sym(m.group()))
+        elif k == _INT:
+            values.append(int(m.group()))
+        elif k == _FLOAT:
+            values.append(float(m.group()))
+        else:
+            values.append(m.group())
+    return kinds, values
 
 def parse(program: str) -> Exp:
     """Read a Scheme expression from a string"""
-    return read_from_tokens(tokenize(program))
+    kinds, values = tokenize(program)
+    exp, _ = read_from_tokens(kinds, values)
+    return exp
 
-def read_from_tokens(tokens: list) -> Exp:
-    """Read a Scheme expression from a sequence of tokens"""
-    if len(tokens) == 0:
+def read_from_tokens(kinds: array, values: list, i: int = 0) -> tuple:
+    """Read a Scheme expression starting at token i; return (exp, next index)"""
+    # an index cursor keeps this O(n); tokens.pop(0) would be O(n) per token
+    n = len(kinds)
+    if i >= n:
         raise SyntaxError('unexpected EOF')
-    token = tokens.pop(0) # pop is used to consume
-    if token == '(':
+    kind = kinds[i]
+    i += 1
+    if kind == _LPAREN:
         L = []
-        while tokens[0] != ')': # recurse until hitting )
-            L.append(read_from_tokens(tokens)) 
-        tokens.pop(0) # pop off )
-        return L
-    elif token == ')':
+        while i < n and kinds[i] != _RPAREN: # recurse until hitting )
+            exp, i = read_from_tokens(kinds, values, i)
+            L.append(exp)
+        if i >= n:
+            raise SyntaxError('unexpected EOF')
+        return L, i + 1 # skip over )
+    elif kind == _RPAREN:
         raise SyntaxError('unexpected )')
     else:
-        return atom(token)
+        return values[i - 1], i
+
+# number triage compiled once: symbols (the common case) no longer pay
+# for a raised-and-caught ValueError from int() and another from float()
+_INT_RE = re.compile(r'[-+]?\d+$').match
+_FLOAT_RE = re.compile(r'[-+]?(\d+\.\d*|\.\d+|\d+)([eE][-+]?\d+)?$').match
 
 def atom(token: str) -> Atom:
     """Make an atom out of a token"""
-    try: return int(token)
-    except ValueError:
-        try: return float(token)
-        except ValueError:
-            return Symbol(token)
+    if _INT_RE(token): return int(token)
+    if _FLOAT_RE(token): return float(token)
+    return Sym(token)
 
 def standard_env() -> Env:
     """An environment with some Scheme standard procedures"""
     env = Env()
     env.update(vars(math))
     env.update({
-        # TODO make operators like + for apply
-        '+':op.add, '-':op.sub, '*':op.mul, '/':op.truediv,
+        # + and * are variadic like real Scheme, with the dominant 2-arg
+        # case answered before falling back to the general reduction
+        '+': lambda *x: x[0] + x[1] if len(x) == 2 else sum(x),
+        '*': lambda *x: x[0] * x[1] if len(x) == 2 else math.prod(x),
+        '-':op.sub, '/':op.truediv,
         '>':op.gt, '<':op.lt, '>=':op.ge, '<=':op.le, '=':op.eq,
         'abs':      abs,
         'append':   op.add,
@@ -81,64 +142,112 @@ def standard_env() -> Env:
         'round':    round,
         'symbol?':  lambda x: isa(x, Symbol),
     })
+    for name in list(env):
+        Sym(name)  # intern builtin names too, so atom() returns identical objects
     return env
         
-def schemestr(exp) -> str:
+def schemestr(exp: Exp) -> str:
     """Convert python object back to a Scheme-readable string"""
+    buf: list = []
+    _schemestr(exp, buf)
+    return ''.join(buf)
+
+def _schemestr(exp: Exp, buf: list) -> None:
+    # pieces accumulate in one buffer that schemestr joins once, instead
+    # of allocating a joined intermediate string per nested list
     if isa(exp, List):
-        return '(' + ' '.join(map(schemestr, exp)) + ')'
+        buf.append('(')
+        sep = ''
+        for e in exp:
+            buf.append(sep)
+            sep = ' '
+            _schemestr(e, buf)
+        buf.append(')')
     else:
-        return str(exp)
+        buf.append(str(exp))
 
 class Env(dict):
     """An environment: a dict of {'var': val} pairs, with an outer Env"""
-    def __init__(self, params=(), args=(), outer=None):
+    def __init__(self, params=(), args=(), outer=None) -> None:
         self.update(zip(params, args))
         self.outer = outer
-    
-    def find(self, var):
+
+    def find(self, var: str) -> dict:
         """Find the innermost Env where var appears"""
-        return self if (var in self) else self.outer.find(var)
+        # a loop instead of recursion: no Python frame per enclosing scope
+        e = self
+        while e is not None:
+            if var in e: return e
+            e = e.outer
+        raise LookupError(var)
+
+    def __missing__(self, var: str):
+        # lets eval do env[var] and get the first-level hit in C
+        return self.find(var)[var]
 
 class Procedure(object):
     """User-defined Scheme procedure"""
-    def __init__(self, params, body, env):
-        self.params, self.body, self.env = params, body, env
-    
+    def __init__(self, params: list, body, env: Env) -> None:
+        self.params, self.body, self.env = tuple(params), body, env
+
+    def frame(self, args) -> Env:
+        """Build the call Env directly, skipping Env.__init__ dispatch."""
+        e: Env = Env.__new__(Env)
+        dict.__init__(e, zip(self.params, args))
+        e.outer = self.env
+        return e
+
     def __call__(self, *args):
-        return eval(self.body, Env(self.params, args, self.env))
+        return eval(self.body, self.frame(args))
 
 global_env = standard_env()
 
-def eval(x: Exp, env=global_env) -> Exp:
+# the default args bind hot globals as locals: LOAD_FAST instead of a
+# LOAD_GLOBAL dict probe on every iteration of the interpreter loop
+def eval(x: Exp, env=global_env, _type=type, _Symbol=Symbol, _List=List,
+         _Procedure=Procedure) -> Exp:
     """Evaluate an expression in an environment"""
-    if isa(x, Symbol):              # variable reference 
-        return env.find(x)[x]
-    elif not isa(x, List):          # constant number
-        return x
-    op, *args = x
-    if op == 'quote':               # quotation
-        return args[0]
-    elif op == 'if':                # conditional
-        # this is called 'destructuring'
-        test, conseq, alt = args
-        exp = conseq if eval(test, env) else alt
-        return eval(exp, env)
-    elif op == 'define':            # definition
-        symbol, exp = args
-        env[symbol] = eval(exp, env)
-    elif op == 'set!':              # assignment
-        symbol, exp = args
-        env.find(symbol)[symbol] = eval(exp, env)
-    elif op == 'lambda':            # procedure
-        params, body = args
-        return Procedure(params, body, env)
-    else:                           # procedure call
-        proc = eval(op, env) 
-        args = [eval(arg, env) for arg in args]
-        return proc(*args)
-
-def repl(prompt='lis.py> '):
+    # tail positions rebind x/env and loop instead of recursing, so
+    # tail-recursive Scheme runs in constant Python stack
+    _eval = eval    # local binding: skip the global name lookup per node
+    while True:
+        if _type(x) is _Symbol:         # variable reference
+            return env[x]               # (type is: one C compare, no MRO walk)
+        elif _type(x) is not _List:     # constant number
+            return x
+        op, *args = x
+        if op is _quote:                # quotation
+            return args[0]
+        elif op is _if:                 # conditional
+            # this is called 'destructuring'
+            test, conseq, alt = args
+            x = conseq if _eval(test, env) else alt
+        elif op is _define:             # definition
+            symbol, exp = args
+            env[symbol] = _eval(exp, env)
+            return None
+        elif op is _set:                # assignment
+            symbol, exp = args
+            env.find(symbol)[symbol] = _eval(exp, env)
+            return None
+        elif op is _lambda:             # procedure
+            params, body = args
+            return _Procedure(params, body, env)
+        else:                           # procedure call
+            proc = _eval(op, env)
+            if _type(proc) is _Procedure: # tail call: reuse this frame
+                args = [_eval(arg, env) for arg in args]
+                x = proc.body
+                env = proc.frame(args)
+            else:                       # unrolled for the common 1/2-arg ops:
+                n = len(args)           # no intermediate args list to allocate
+                if n == 1:
+                    return proc(_eval(args[0], env))
+                elif n == 2:
+                    return proc(_eval(args[0], env), _eval(args[1], env))
+                return proc(*[_eval(arg, env) for arg in args])
+
+def repl(prompt: str = 'lis.py> ') -> None:
     """A read-eval-print-loop"""
     while True:
         cmd = input(prompt)
@@ -148,7 +257,7 @@ def repl(prompt='lis.py> '):
         if val is not None:
             print(schemestr(val))
 
-def lispstr(x):
+def lispstr(x) -> str:
     "Convert a Python object back into a Lisp-readable string."
     if x is True: return "#t"
     elif x is False: return "#f"
@@ -4,6 +4,7 @@
 # but works the same as original.
 
 import re, sys, io # StringIO -> io.StringIO
+from collections import namedtuple
 
 ################ Symbol, Procedure, classes
 
@@ -15,24 +16,64 @@ def Sym(s, symbol_table={}):
     return symbol_table[s]
 
 # destructuring in action again (this time with result of map)
-_quote, _if, _set, _define, _lambda, _begin, _definemacro = map(Sym, 
-"quote   if   set!   define   lambda   begin   define-macro".split())
+_quote, _if, _set, _define, _lambda, _begin, _definemacro, _definepure = map(Sym,
+"quote   if   set!   define   lambda   begin   define-macro   define-pure".split())
 
 _quasiquote, _unquote, _unquotesplicing = map(Sym, 
 "quasiquote   unquote   unquote-splicing".split())
 
+# expand folds (if test conseq alt) into this node, so eval dispatches on
+# one C-level type(x) compare and reads fields instead of destructuring a list
+If = namedtuple('If', 'test conseq alt')
+
+class VarRef(object):
+    """A Symbol resolved at parse time to (depth, name): eval walks depth
+    outer frames and indexes the Env directly instead of calling find()"""
+    __slots__ = ('depth', 'name')
+    def __init__(self, depth, name):
+        self.depth, self.name = depth, name
+    def __repr__(self): return '<%s@%d>' % (self.name, self.depth)
+
 class Procedure(object):
     """User-defined Scheme procedure"""
     def __init__(self, params, exp, env):
         self.params, self.exp, self.env = params, exp, env
-    
+        # decide the frame shape once here rather than per call in Env.__init__
+        self.variadic = isinstance(params, Symbol)
+        self.arity = None if self.variadic else len(params)
+        self.cache = None   # (define-pure ...) swaps in a dict of args -> value
+
+    def frame(self, args):
+        """Build the Env for a call; the shape checks were done in __init__.
+        A list the caller owns (eval's evaluated args) is bound directly
+        for variadic params instead of being copied."""
+        env = Env.__new__(Env)
+        env.outer = self.env
+        if self.variadic:
+            dict.__setitem__(env, self.params,
+                             args if type(args) is list else list(args))
+        else:
+            if len(args) != self.arity:
+                raise TypeError(f"expected {lispstr(self.params)}, given {lispstr(args)}")
+            dict.update(env, zip(self.params, args))
+        return env
+
     def __call__(self, *args):
-        return eval(self.exp, Env(self.params, args, self.env))
+        cache = self.cache
+        if cache is None:
+            return eval(self.exp, self.frame(args))
+        try:
+            return cache[args]
+        except TypeError:           # unhashable argument: skip the cache
+            return eval(self.exp, self.frame(args))
+        except KeyError:
+            val = cache[args] = eval(self.exp, self.frame(args))
+            return val
     
 ################ parse, read, and user interaction
 
 def parse(inport):
-    """Parse a program: read and expand/error-check it."""
+    """Parse a program: read, then expand/error-check/resolve in one walk."""
     if isinstance(inport, str): inport = InPort(io.StringIO(inport))
     return expand(read(inport), toplevel=True)
 
@@ -45,16 +86,19 @@ class InPort(object):
 
     def __init__(self, file):
         self.file = file; self.line = ''
-        
+
     def next_token(self):
         """Return the next token, reading new text into line buffer if needed."""
         while True:
             if self.line == '': self.line = self.file.readline()
             if self.line == '': return eof_object
-            token, self.line = re.match(InPort.tokenizer, self.line).groups()
+            token, self.line = _tokenizer_match(self.line).groups()
             if token != '' and not token.startswith(';'):
                 return token
 
+# compiled once; re.match(InPort.tokenizer, ...) re-resolved both per token
+_tokenizer_match = re.compile(InPort.tokenizer).match
+
 def readchar(inport):
     """Read next char from an inport port"""
     if inport.line != '':
@@ -73,9 +117,10 @@ def read(inport):
                 if token == ')': return L
                 else: L.append(read_ahead(token))
         elif ')' == token: raise SyntaxError('unexpected )')
-        elif token in quotes: return [quotes[token], read(inport)]
         elif token is eof_object: raise SyntaxError('unexpected EOF in list')
-        else: return atom(token)
+        q = quotes.get(token)           # one dict probe, not 'in' plus getitem
+        if q is not None: return [q, read(inport)]
+        return atom(token)
      # body of read:
     token1 = inport.next_token()
     return eof_object if token1 is eof_object else read_ahead(token1)
@@ -96,15 +141,27 @@ def atom(token):
             except ValueError:
                 return Sym(token)
 
-def lispstr(x):
+def lispstr(x, _buf=None):
     "Convert a Python object back into a Lisp-readable string."
-    if x is True: return "#t"
-    elif x is False: return "#f"
-    elif isa(x, Symbol): return x
-    elif isa(x, str): return '"%s"' % x.encode('unicode_escape').replace('"',r'\"')
-    elif isa(x, list): return '('+' '.join(map(lispstr, x))+')'
-    elif isa(x, complex): return str(x).replace('j', 'i')
-    else: return str(x)
+    # pieces accumulate in one buffer joined once at the top call, instead
+    # of allocating a joined intermediate string per nested list
+    buf = [] if _buf is None else _buf
+    if x is True: buf.append("#t")
+    elif x is False: buf.append("#f")
+    elif isa(x, Symbol): buf.append(x)
+    elif isa(x, str):
+        buf.append('"%s"' % x.encode('unicode_escape').decode().replace('"', r'\"'))
+    elif isa(x, (list, Cons)):
+        buf.append('(')
+        sep = ''
+        for e in x:
+            buf.append(sep)
+            sep = ' '
+            lispstr(e, buf)
+        buf.append(')')
+    elif isa(x, complex): buf.append(str(x).replace('j', 'i'))
+    else: buf.append(str(x))
+    if _buf is None: return ''.join(buf)
 
 def load(filename):
     """Eval every expression from a file."""
@@ -140,13 +197,60 @@ class Env(dict):
     
     def find(self, var):
         """Find the innermost Env where var appears"""
-        if var in self: return self
-        elif self.outer is None: raise LookupError(var)
-        else: return self.outer.find(var)
-
-
-def is_pair(x): return x != [] and isa(x, list)
-def cons(x, y): return [x]+y
+        # a loop instead of recursion: no Python frame per enclosing scope
+        e = self
+        while e is not None:
+            if var in e: return e
+            e = e.outer
+        raise LookupError(var)
+
+    def __missing__(self, var):
+        # lets eval do env[var] and get the first-level hit in C
+        return self.find(var)[var]
+
+
+class Cons(object):
+    """A persistent pair: car/cdr are O(1) and the tail is shared, not
+    copied. The tail may be another Cons or a Python list ('() is [])."""
+    __slots__ = ('car', 'cdr')
+
+    def __init__(self, car, cdr):
+        self.car = car
+        self.cdr = cdr
+
+    def __iter__(self):
+        p = self
+        while type(p) is Cons:
+            yield p.car
+            p = p.cdr
+        yield from p            # the final tail is a Python list
+
+    def __len__(self):
+        n, p = 1, self.cdr
+        while type(p) is Cons:
+            n += 1
+            p = p.cdr
+        return n + len(p)
+
+    def __eq__(self, other):
+        # chains compare equal to lists with the same elements, so Cons
+        # values interoperate with reader-built lists and Python code
+        if not isa(other, (Cons, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self): return lispstr(self)
+
+def is_pair(x): return x != [] and isa(x, (list, Cons))
+def cons(x, y): return Cons(x, y)
+
+def append(x, y):
+    """(append x y): rebuild x's spine onto y, sharing y instead of copying."""
+    for item in reversed(list(x)):
+        y = Cons(item, y)
+    return y
 
 # TODO store the continuation away and call it multiple times, each time 
 # returning to the same place. (like true Scheme call/cc)
@@ -168,18 +272,20 @@ def add_globals(env) -> Env:
     # made + be variadic
     # TODO: would be fun to allow variadic args for lambdas
     env.update({
-     '+': lambda *x: sum(x), '-': op.sub, '*': op.mul, '/': op.truediv, 'not': op.not_, 
+     # 2-arg fast path first: most additions are binary
+     '+': lambda *x: x[0] + x[1] if len(x) == 2 else sum(x),
+     '-': op.sub, '*': op.mul, '/': op.truediv, 'not': op.not_,
      '>': op.gt, '<': op.lt, '>=': op.ge, '<=': op.le, '=': op.eq, 
      'abs': abs, # bug: this is built-in and wasn't included 
      'equal?': op.eq, 
      'eq?': op.is_, 
      'length': len, 
-     'cons': lambda x,y:[x]+list(y), 
-     'car': lambda x:x[0], 
-     'cdr': lambda x:x[1:], 
-     'append': op.add,  
-     'list': lambda *x:list(x), 
-     'list?': lambda x:isa(x,list),
+     'cons': cons,
+     'car': lambda x: x.car if type(x) is Cons else x[0],
+     'cdr': lambda x: x.cdr if type(x) is Cons else x[1:],
+     'append': append,
+     'list': lambda *x:list(x),
+     'list?': lambda x:isa(x,(list,Cons)),
      'null?': lambda x:x==[], 
      'symbol?': lambda x: isa(x, Symbol),
      'boolean?': lambda x: isa(x, bool), 
@@ -187,7 +293,7 @@ def add_globals(env) -> Env:
      'port?': lambda x:isa(x,file), 
      'map': lambda x, y: list(map(x, y)),
      'apply': lambda proc, *l: proc(*l), # made apply take in variadic args
-     'eval': lambda x: eval(expand(x)), 
+     'eval': lambda x: eval(expand(x)),
      'load': lambda fn: load(fn), 
      'call/cc': callcc,
      'open-input-file': open,
@@ -206,97 +312,134 @@ global_env = add_globals(Env())
 
 ################ eval (tail recursive)
 
-def eval(x, env=global_env):
+# the default args bind hot globals as locals: LOAD_FAST instead of a
+# LOAD_GLOBAL dict probe on every iteration of the interpreter loop
+def eval(x, env=global_env, _type=type, _Symbol=Symbol, _VarRef=VarRef,
+         _If=If, _list=list, _Procedure=Procedure):
     """Evaluate an expression in an environment"""
+    _eval = eval    # local binding: skip the global name lookup per node
     while True:
-        if isa(x, Symbol):              # variable reference 
-            return env.find(x)[x]
-        elif not isa(x, list):          # constant number
+        if _type(x) is _VarRef:         # resolved variable reference
+            e = env
+            for _ in range(x.depth):
+                e = e.outer
+            return e[x.name]
+        elif isa(x, _Symbol):           # variable reference
+            return env[x]
+        elif _type(x) is _If:           # (if test conseq alt), folded node
+            x = x.conseq if _eval(x.test, env) else x.alt
+            continue
+        elif not isa(x, _list):         # constant number
             return x
         if x[0] == _quote:               # (quote exp)
             _, exp = x
             return exp
-        elif x[0] == _if:                # (if test conseq alt)
-            # this is called 'destructuring'
-            _, test, conseq, alt = x
-            x = conseq if eval(test, env) else alt
         elif x[0] == _set:               # (set! var exp)
             _, var, exp = x
-            env.find(var)[var] = eval(exp, env)
+            env.find(var)[var] = _eval(exp, env)
             return None
         elif x[0] == _define:            # (define var exp)
             _, var, exp = x
-            env[var] = eval(exp, env)
+            env[var] = _eval(exp, env)
+            return None
+        elif x[0] == _definepure:        # (define-pure var exp): memoized define
+            _, var, exp = x
+            proc = _eval(exp, env)
+            require(x, isa(proc, Procedure), "define-pure requires a lambda")
+            proc.cache = {}
+            env[var] = proc
             return None
         elif x[0] == _lambda:            # (lambda (var*) exp)
             _, params, exp = x
-            return Procedure(params, exp, env)
+            return _Procedure(params, exp, env)
         elif x[0] == _begin:             # (begin exp+)
             for exp in x[1:-1]:
-                eval(exp, env)
+                _eval(exp, env)
             x = x[-1]
         else:                           # (proc exp*)
-            exps = [eval(exp, env) for exp in x]
-            proc = exps.pop(0) 
-            if isa(proc, Procedure):
+            proc = _eval(x[0], env)
+            if _type(proc) is _Procedure:
+                exps = [_eval(exp, env) for exp in x[1:]]
+                if proc.cache is not None:
+                    return proc(*exps)  # memoized: call so the result is recorded
                 x = proc.exp
-                env = Env(proc.params, exps, proc.env)
-            else:
-                return proc(*exps)
-
-################ expand (handle macros)
-
-def expand(x, toplevel=False):
-    """Walk tree of x and make optimizations/fixes, and signal SyntaxError"""
+                env = proc.frame(exps)
+            else:                       # unrolled for the common 1/2-arg ops:
+                n = len(x)              # no intermediate args list to allocate
+                if n == 2:
+                    return proc(_eval(x[1], env))
+                elif n == 3:
+                    return proc(_eval(x[1], env), _eval(x[2], env))
+                return proc(*[_eval(exp, env) for exp in x[1:]])
+
+################ expand (handle macros, resolve references)
+
+def expand(x, toplevel=False, scopes=()):
+    """Walk tree of x once: macro/syntax rewrites, error checks, and
+    resolution of statically known Symbols to VarRefs (see defined_names).
+    scopes is the lexical stack, innermost first: one (params, maybe-
+    defined) pair per enclosing lambda."""
+    if type(x) is Cons: x = list(x)     # macros build code with runtime cons
     require(x, x != [])                 # () => Error
-    if not isa(x, list):                # constant
+    if isa(x, Symbol):                  # resolve now if the frame is known
+        for depth, (params, maybe) in enumerate(scopes):
+            if x in params: return VarRef(depth, x)
+            if maybe is None or x in maybe:
+                return x                # a define may bind it here at runtime
+        return x                        # global (or unbound): look up dynamically
+    elif not isa(x, list):              # constant (or an already-expanded node)
         return x
     elif x[0] is _quote:                  # (quote exp)
         require(x, len(x) == 2)
         return x
     elif x[0] is _if:
-        if len(x) == 3: x = x + [None]  # (if t c) => (if t c None) 
+        if len(x) == 3: x = x + [None]  # (if t c) => (if t c None)
         require(x, len(x) == 4)
-        return list(map(expand, x))
+        return If(expand(x[1], scopes=scopes), expand(x[2], scopes=scopes),
+                  expand(x[3], scopes=scopes))
     elif x[0] is _set:                    # (set! non-var exp) => Error
         require(x, len(x) == 3)
         var = x[1]
         require(x, isa(var, Symbol), "can set! only a symbol")
-        return [_set, var, expand(x[2])]
-    elif x[0] is _define or x[0] is _definemacro:
+        return [_set, var, expand(x[2], scopes=scopes)]
+    elif x[0] is _define or x[0] is _definemacro or x[0] is _definepure:
         require(x, len(x) >= 3)
         _def, v, body = x[0], x[1], x[2:]
         if isa(v, list) and v:          # (define (f args) body)
             f, args = v[0], v[1:]       # => (define f (lambda (args) body))
-            return expand([_def, f, [_lambda, args] + body])
+            return expand([_def, f, [_lambda, args] + body], toplevel, scopes)
         else:
             require(x, len(x) == 3)     # (define non-var/list exp) => Error
             require(x, isa(v, Symbol), "can define only a symbol")
-            exp = expand(x[2])
+            exp = expand(x[2], scopes=scopes)
             if _def is _definemacro:
                 require(x, toplevel, "define-macro only allowed at top level")
                 proc = eval(exp)
                 require(x, callable(proc), "macro must be a procedure")
                 macro_table[v] = proc   # (define-macro v proc)
                 return None             # => None; add v:proc to macro_table
-            return [_define, v, exp]
+            return [_def, v, exp]
     elif x[0] is _begin:
         if len(x) == 1: return None     # (begin) => None
-        else: return [expand(xi, toplevel) for xi in x]
-    elif x[0] is _lambda:               # (lambda (x) e1 e2) 
+        else: return [expand(xi, toplevel, scopes) for xi in x]
+    elif x[0] is _lambda:               # (lambda (x) e1 e2)
         require(x, len(x) >= 3)         #  => (lambda (x) (begin e1 e2))
         vars, body = x[1], x[2:]
         require(x, (isa(vars, list) and all(isa(v, Symbol) for v in vars))
                 or isa(vars, Symbol), "illegal lambda argument list")
         exp = body[0] if len(body) == 1 else [_begin] + body
-        return [_lambda, vars, expand(exp)]
+        frame = {vars} if isa(vars, Symbol) else set(vars)
+        maybe = set()
+        if defined_names(exp, maybe):
+            maybe = None                # opaque body: resolve params only
+        return [_lambda, vars, expand(exp, False, ((frame, maybe),) + tuple(scopes))]
     elif x[0] is _quasiquote:
         require(x, len(x) == 2)
-        return expand_quasiquote(x[1])
+        return expand(expand_quasiquote(x[1]), False, scopes)
     elif isa(x[0], Symbol) and x[0] in macro_table:
-        return expand(macro_table[x[0]](*x[1:]), toplevel) # (m arg...) 
+        return expand(macro_table[x[0]](*x[1:]), toplevel, scopes) # (m arg...)
     else:                                #        => macroexpand if m isa macro
-        return list(map(expand, x))            # (f arg...) => expand each
+        return [expand(xi, scopes=scopes) for xi in x]  # (f arg...) => expand each
 
 def require(x, predicate, msg="wrong length"):
     """Signal a syntax error if predicate is false."""
@@ -326,11 +469,33 @@ def let(*args):
     blist = [isa(b, list) and len(b) == 2 and isa(b[0], Symbol) for b in bindings]
     require(x, all(blist), "illegal binding list")
     vars, vals = zip(*bindings)
-    # bug: did not list() map
-    return [[_lambda, list(vars)] + list(map(expand, body))] + list(map(expand, vals))
+    # returned raw: the caller (expand's macro branch) expands the whole
+    # template once, with the right lexical scopes
+    return [[_lambda, list(vars)] + list(body)] + list(vals)
 
 macro_table = {_let:let} # More macros can go here
 
+def defined_names(x, names):
+    """Collect names a (define var ...) in x could add to the current frame.
+    Does not enter quotes or nested lambdas (those bind their own frames).
+    Returns True when x hides an unexpanded macro call, meaning anything
+    might be defined here and resolution must stay dynamic."""
+    opaque = False
+    if type(x) is If:
+        for xi in x:
+            opaque |= defined_names(xi, names)
+    elif isa(x, list) and x and x[0] is not _quote and x[0] is not _lambda:
+        if x[0] is _define or x[0] is _definepure:
+            v = x[1]
+            while isa(v, list) and v:   # (define (f a) ...) and curried
+                v = v[0]                # (define ((f a) b) ...) sugar
+            names.add(v)
+        elif isa(x[0], Symbol) and x[0] in macro_table:
+            opaque = True
+        for xi in x:
+            opaque |= defined_names(xi, names)
+    return opaque
+
 # adds the and macro to the macro_table
 eval(parse("""(begin
 (define-macro and (lambda args 
@@ -54,6 +54,10 @@ lispy_tests = [
     ("(define ((account bal) amt) (set! bal (+ bal amt)) bal)", None),
     ("(define a1 (account 100))", None),
     ("(a1 0)", 100), ("(a1 10)", 110), ("(a1 10)", 120),
+    ("""(define (outer) ;; curried define nested in a lambda body
+    (define ((acct bal) amt) (set! bal (+ bal amt)) bal)
+    ((acct 5) 1))""", None),
+    ("(outer)", 6),
     ("""(define (newton guess function derivative epsilon)
     (define guess2 (- guess (/ (function guess) (derivative guess))))
     (if (< (abs (- guess guess2)) epsilon) guess2
@@ -88,6 +92,13 @@ lispy_tests = [
     ("(quote (1 2 three))", [1, 2, 'three']), 
     ("'x", 'x'),
     ("'(one 2 3)", ['one', 2, 3]),
+    ("(cons 1 (cons 2 '()))", [1, 2]), ## persistent pairs compare equal to lists
+    ("(cdr (cons 1 '(2 3)))", [2, 3]),
+    ("(append '(1 2) '(3 4))", [1, 2, 3, 4]),
+    ("(pair? (cons 1 '(2)))", True),
+    ("(define-pure (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))", None),
+    ("(fib 30)", 832040), ## memoized: O(n) evals instead of O(phi^n)
+    ("(define-pure notalambda 3)", SyntaxError),
     ("(define L (list 1 2 3))", None),
     ("`(testing ,@L testing)", ['testing',1,2,3,'testing']),
     ("`(testing ,L testing)", ['testing',[1,2,3],'testing']),